@@ -1,10 +1,12 @@
 from flask import Blueprint, jsonify
 from src.utils.logger import log_message, HTTP_LOG_ID
 from src.routes.CommandRoutes import start_server, stop_server
+from src.utils.HeavyExecutor import heavy_endpoint
 
 commandListener_bp = Blueprint("commandListener", __name__)
 
 @commandListener_bp.route("/command/listen/start", methods=["POST", "GET"])
+@heavy_endpoint
 def command_listen_start():
     try:
         started = start_server()
@@ -16,6 +18,7 @@ def command_listen_start():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @commandListener_bp.route("/command/listen/stop", methods=["POST", "GET"])
+@heavy_endpoint
 def command_listen_stop():
     try:
         stopped = stop_server()
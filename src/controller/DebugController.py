@@ -0,0 +1,64 @@
+import os
+from flask import Blueprint, request, jsonify, send_file
+from src.utils.logger import log_message, HTTP_LOG_ID
+from src.utils.api_auth import requires_auth
+from src.utils.Profiler import send_command, check_target, collapsed_path, memory_path
+
+debug_bp = Blueprint("debug", __name__)
+
+# Every route takes ?target=web|speech (default web). In pre-fork mode only "speech" can be profiled.
+
+def _command(action, **params):
+    target = request.args.get("target", "web")
+    try:
+        result = send_command(target, dict(action=action, **params))
+        log_message(HTTP_LOG_ID, f"Profiling {action} on {target}: {result.get('status')}")
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+def _download(path_for):
+    target = request.args.get("target", "web")
+    try:
+        check_target(target)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    path = path_for(target)
+    if not os.path.exists(path):
+        return jsonify({"status": "error", "message": "No profile output yet"}), 404
+    return send_file(path, mimetype="text/plain", as_attachment=True, download_name=os.path.basename(path))
+
+@debug_bp.route("/debug/profile/start", methods=["POST", "GET"])
+@requires_auth
+def profile_start():
+    # ?seconds=10&interval_ms=5
+    return _command("profile_start",
+                    seconds=request.args.get("seconds", 10),
+                    interval_ms=request.args.get("interval_ms", 5))
+
+@debug_bp.route("/debug/profile/stop", methods=["POST", "GET"])
+@requires_auth
+def profile_stop():
+    return _command("profile_stop")
+
+@debug_bp.route("/debug/profile/download", methods=["GET"])
+@requires_auth
+def profile_download():
+    # Collapsed stacks: `flamegraph.pl web.collapsed > web.svg` or drop into speedscope.app.
+    return _download(collapsed_path)
+
+@debug_bp.route("/debug/memory/snapshot", methods=["POST", "GET"])
+@requires_auth
+def memory_snapshot():
+    # First call starts tracemalloc; later calls report top allocations and the diff since the last one.
+    return _command("memory_snapshot", limit=request.args.get("limit", 25))
+
+@debug_bp.route("/debug/memory/stop", methods=["POST", "GET"])
+@requires_auth
+def memory_stop():
+    return _command("memory_stop")
+
+@debug_bp.route("/debug/memory/download", methods=["GET"])
+@requires_auth
+def memory_download():
+    return _download(memory_path)
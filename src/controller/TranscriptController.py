@@ -0,0 +1,25 @@
+from flask import Blueprint, request, jsonify
+from src.utils.logger import log_message, HTTP_LOG_ID
+from src.utils.api_auth import requires_auth
+from src.utils.TranscriptStore import search_transcripts
+
+transcript_bp = Blueprint("transcript", __name__)
+
+@transcript_bp.route("/transcripts/search", methods=["GET"])
+@requires_auth
+def transcripts_search():
+    # ?q=words&page=1&per_page=50&device=3&since=<unix ts>&until=<unix ts>
+    try:
+        result = search_transcripts(
+            q=request.args.get("q"),
+            page=request.args.get("page", 1),
+            per_page=request.args.get("per_page", 50),
+            device_id=request.args.get("device"),
+            since=request.args.get("since"),
+            until=request.args.get("until"))
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Invalid parameter: {e}"}), 400
+    except Exception as e:
+        log_message(HTTP_LOG_ID, f"Transcript search failed: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
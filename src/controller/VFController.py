@@ -1,6 +1,7 @@
 from flask import Blueprint, Flask, request, send_from_directory, render_template, jsonify
 from src.utils.logger import log_message, HTTP_LOG_ID
 from src.utils.VFUtils import convert_webm_to_mp4, convert_mp4_to_wav
+from src.utils.HeavyExecutor import heavy_endpoint
 import os
 import uuid
 
@@ -14,6 +15,7 @@ def footageReference():
     return render_template("auth-ref-footage.html")
 
 @vf_bp.route("/vf/upload", methods=["POST"])
+@heavy_endpoint
 def upload():
     if "file" not in request.files:
         return "No file part", 400
@@ -29,22 +31,27 @@ def upload():
     # Convert WebM → MP4
     mp4_filename = f"{uuid.uuid4()}.mp4"
     mp4_path = os.path.join(UPLOAD_FOLDER, mp4_filename)
-    convert_webm_to_mp4(temp_webm_path, mp4_path)
+    profile = convert_webm_to_mp4(temp_webm_path, mp4_path)
 
     # Convert MP4 → WAV
     wav_filename = f"{uuid.uuid4()}.wav"
     wav_path = os.path.join(UPLOAD_FOLDER, wav_filename)
     convert_mp4_to_wav(mp4_path, wav_path)
 
-    # Remove temporary WebM
-    os.remove(temp_webm_path)
-
-    # Return filenames to frontend
-    return jsonify({
+    # Remove temporary WebM, unless the MP4 has no video track: then the WebM is the only copy of the video
+    response = {
         "message": "Upload successful",
         "mp4_file": mp4_filename,
-        "wav_file": wav_filename
-    }), 200
+        "wav_file": wav_filename,
+        "encode_profile": profile
+    }
+    if profile == "audio-only":
+        response["webm_file"] = temp_webm
+    else:
+        os.remove(temp_webm_path)
+
+    # Return filenames to frontend
+    return jsonify(response), 200
 
 @vf_bp.route("/uploads/<filename>")
 def uploaded_file(filename):
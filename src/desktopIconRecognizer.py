@@ -1,21 +1,35 @@
 import pyautogui
-import time
 
 from mouseMove import move, click  # import your existing functions
+from screenObserver import wait_until_stable, wait_until_matches
+
+# After a double-click the selection highlight changes the screen at once, then nothing moves until the app
+# window appears. The screen must stay unchanged this long before the launch counts as finished.
+LAUNCH_SETTLE = 0.75
 
 def minimizeDesktop():
     # Minimize all windows to show desktop
     print("Minimizing all windows to reveal desktop...")
     pyautogui.hotkey('win', 'd')
-    time.sleep(1)  # wait a moment for desktop to appear
+    wait_until_stable(timeout=1)  # return as soon as the desktop has appeared (at most 1s)
+
+def _wait_for_launch(wait_time, expected_image, expected_region):
+    if expected_image:
+        # Exact: return as soon as the app shows its expected state.
+        wait_until_matches(expected_image, region=expected_region, timeout=wait_time)
+    else:
+        wait_until_stable(timeout=wait_time, stable_for=min(LAUNCH_SETTLE, wait_time), change_timeout=0)
 
-def click_icon(icon_image_path, confidence=0.8, wait_time=1):
+def click_icon(icon_image_path, confidence=0.8, wait_time=1, expected_image=None, expected_region=None):
     """
     Recognizes an icon on the desktop by image and clicks it safely.
     
     :param icon_image_path: Path to the screenshot of the icon (PNG recommended)
     :param confidence: Matching confidence (0.0 - 1.0)
-    :param wait_time: Time to wait after clicking
+    :param wait_time: Maximum time to wait for the app after clicking
+    :param expected_image: Optional PNG of expected_region once the app is open; without it the screen
+                           must stay unchanged for LAUNCH_SETTLE seconds (capped by wait_time)
+    :param expected_region: (left, top, width, height) matching expected_image, or None for the whole screen
     :return: True if icon found and clicked, False otherwise
     """
     try:
@@ -26,7 +40,7 @@ def click_icon(icon_image_path, confidence=0.8, wait_time=1):
             center = pyautogui.center(location)
             move(center.x, center.y)
             click(clicks=2, interval=0.25)  # double-click with 0.25s between clicks
-            time.sleep(wait_time)
+            _wait_for_launch(wait_time, expected_image, expected_region)
             return True
         else:
             print(f"Icon '{icon_image_path}' not found on screen!")
@@ -38,7 +52,7 @@ def click_icon(icon_image_path, confidence=0.8, wait_time=1):
                 center = pyautogui.center(location)
                 move(center.x, center.y)
                 click(clicks=2, interval=0.25)  # double-click with 0.25s between clicks
-                time.sleep(wait_time)
+                _wait_for_launch(wait_time, expected_image, expected_region)
                 return True
             else:
                 print(f"Still could not find icon '{icon_image_path}' even after minimizing windows.")
@@ -0,0 +1,177 @@
+import json
+import time
+
+import pyautogui
+
+from mouseMove import move, click  # import your existing functions
+from screenObserver import wait_until_matches
+
+# Compact step format (one JSON array per step, last element = seconds since the previous step):
+#   ["move",  x, y, duration, dt]
+#   ["click", clicks, interval, button, dt]
+#   ["key",   key, dt]
+#   ["hotkey", [keys...], dt]
+#   ["check", image_path, region_or_null, timeout, dt]
+MACRO_VERSION = 1
+
+
+class MacroRecorder:
+    """
+    Records move/click/key actions while performing them, so a script run once can be replayed later.
+
+    Usage:
+        rec = MacroRecorder()
+        rec.move(200, 500)
+        rec.click(clicks=2)
+        rec.checkpoint("icons/zoom.png")
+        rec.save("macros/open-zoom.json")
+    """
+    def __init__(self, perform=True):
+        """
+        :param perform: Execute each action while recording (False only builds the step list)
+        """
+        self.perform = perform
+        self.steps = []
+        self._last = time.monotonic()
+
+    def _add(self, *step):
+        now = time.monotonic()
+        self.steps.append(list(step) + [round(now - self._last, 3)])
+        self._last = now
+
+    def move(self, x, y, duration=0.5):
+        self._add("move", int(x), int(y), duration)
+        if self.perform:
+            move(x, y, duration=duration)
+        self._last = time.monotonic()
+
+    def click(self, clicks=1, interval=0.25, button="left"):
+        self._add("click", clicks, interval, button)
+        if self.perform:
+            click(clicks=clicks, interval=interval, button=button)
+        self._last = time.monotonic()
+
+    def key(self, key):
+        self._add("key", key)
+        if self.perform:
+            pyautogui.press(key)
+        self._last = time.monotonic()
+
+    def hotkey(self, *keys):
+        self._add("hotkey", list(keys))
+        if self.perform:
+            pyautogui.hotkey(*keys)
+        self._last = time.monotonic()
+
+    def checkpoint(self, image_path, region=None, timeout=5.0):
+        """
+        Records a point where the screen must show image_path before replay continues.
+
+        :param image_path: PNG of the expected state (or an icon to find anywhere when region is None)
+        :param region: (left, top, width, height) the image must match, or None
+        :param timeout: Seconds replay waits for the checkpoint
+        """
+        self._add("check", image_path, list(region) if region else None, timeout)
+        if self.perform and not _checkpoint_reached(image_path, region, timeout):
+            raise RuntimeError(f"Checkpoint '{image_path}' not reached while recording")
+        self._last = time.monotonic()
+
+    def to_json(self):
+        return json.dumps({"v": MACRO_VERSION, "steps": self.steps}, separators=(",", ":"))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+
+def load_macro(path):
+    """Loads the step list written by MacroRecorder.save()."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("v") != MACRO_VERSION:
+        raise ValueError(f"Unsupported macro version {data.get('v')} in {path}")
+    return data["steps"]
+
+
+def _checkpoint_reached(image_path, region, timeout):
+    if region:
+        return wait_until_matches(image_path, region=tuple(region), timeout=timeout)
+    # No region: the image may appear anywhere (e.g. a desktop icon).
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if pyautogui.locateOnScreen(image_path, confidence=0.8):
+                return True
+        except pyautogui.ImageNotFoundException:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+
+
+def replay(steps, speed=1.0, instant=False, min_gap=0.0):
+    """
+    Replays recorded steps with time compression.
+
+    :param steps: Step list (from MacroRecorder.steps or load_macro())
+    :param speed: Time compression factor for recorded gaps and move durations (2.0 = twice as fast)
+    :param instant: Teleport moves, click with min_gap between clicks and ignore recorded gaps
+    :param min_gap: Minimum pause between steps (some apps drop events that arrive too fast)
+    :return: List of per-step timings: {"index", "action", "wait", "run"} in seconds
+    """
+    timings = []
+    # pyautogui sleeps PAUSE (0.1s) after every call; the macro controls its own pacing instead.
+    saved_pause, pyautogui.PAUSE = pyautogui.PAUSE, 0
+    try:
+        for index, step in enumerate(steps):
+            action, args, dt = step[0], step[1:-1], step[-1]
+            wait = min_gap if instant else max(dt / speed, min_gap)
+            if wait:
+                time.sleep(wait)
+            start = time.monotonic()
+            if action == "move":
+                x, y, duration = args
+                move(x, y, duration=0 if instant else duration / speed)
+            elif action == "click":
+                clicks, interval, button = args
+                click(clicks=clicks, interval=min_gap if instant else interval / speed, button=button)
+            elif action == "key":
+                pyautogui.press(args[0])
+            elif action == "hotkey":
+                pyautogui.hotkey(*args[0])
+            elif action == "check":
+                image_path, region, timeout = args
+                if not _checkpoint_reached(image_path, region, timeout):
+                    raise RuntimeError(f"Checkpoint '{image_path}' not reached at step {index}")
+            else:
+                raise ValueError(f"Unknown macro action '{action}' at step {index}")
+            timings.append({"index": index, "action": action, "wait": wait, "run": time.monotonic() - start})
+    finally:
+        pyautogui.PAUSE = saved_pause
+    return timings
+
+
+def format_stats(timings, top=5):
+    """Summarises where a replay spent its time: totals per action and the slowest steps."""
+    total_wait = sum(t["wait"] for t in timings)
+    total_run = sum(t["run"] for t in timings)
+    lines = [f"{len(timings)} steps: {total_wait + total_run:.3f}s total ({total_wait:.3f}s waiting, {total_run:.3f}s running)"]
+    per_action = {}
+    for t in timings:
+        per_action[t["action"]] = per_action.get(t["action"], 0.0) + t["wait"] + t["run"]
+    for action, seconds in sorted(per_action.items(), key=lambda item: -item[1]):
+        lines.append(f"  {action:<7} {seconds:.3f}s")
+    lines.append(f"Slowest {top} steps:")
+    for t in sorted(timings, key=lambda t: -(t["wait"] + t["run"]))[:top]:
+        lines.append(f"  #{t['index']:<4} {t['action']:<7} wait {t['wait']:.3f}s  run {t['run']:.3f}s")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Example: record opening an app from its desktop icon, then replay it instantly.
+    rec = MacroRecorder()
+    rec.hotkey("win", "d")
+    rec.move(200, 500)
+    rec.click(clicks=2)
+    rec.save("macro-example.json")
+    stats = replay(load_macro("macro-example.json"), instant=True, min_gap=0.02)
+    print(format_stats(stats))
@@ -18,7 +18,8 @@ import subprocess # to spawn new processes (starting server/listener).
 import os # general OS utilities (checking/removing files).
 
 from src.utils.PidFiles import stop_process
-from src.settings.constants import APP_ID, APP_NAME, APP_VERSION, PROJECT_ROOT, ROUTE_ROOT, CONTROLLER_ROOT, RPI_ROOT
+from src.utils.StaticAssets import fetch_vendor_assets, build_assets, prune_assets, PRUNE_AFTER_DAYS
+from src.settings.constants import APP_ID, APP_NAME, APP_VERSION, PROJECT_ROOT, ROUTE_ROOT, CONTROLLER_ROOT, RPI_ROOT, WEB_PORT
 from src.utils.logger import HTTP_LOG_ID, STT_LOG_ID, LOG_FILES
 
 # Initializes colorama so Windows & Unix terminals handle color codes.
@@ -28,6 +29,7 @@ init(autoreset=True)
 # Scripts & PID files for HTTP Web Server and Speech Listener Servers
 WEBROUTES_PATH = ROUTE_ROOT / "WebRoutes.py"
 PID_FILE = RPI_ROOT / f"{APP_ID}-server.pid"
+STARTUP_CHECK = 2  # seconds the server must stay up before it is reported as started
 
 # ---------------- Command Definition ----------------
 # Prints a simple CLI help message with colored separators and usage instructions.
@@ -38,14 +40,41 @@ def definition():
     print(f"{APP_ID} --version              : To view the App Version")
     print(f"{APP_ID} automate --start       : Start {APP_NAME} Server & Speech Listener")
     print(f"{APP_ID} automate --stop        : Stop {APP_NAME} Server & Speech Listener")
+    print(f"{APP_ID} automate --start --workers <N|auto> : Start with N dashboard processes (auto = CPU cores)")
+    print(f"{APP_ID} assets --fetch         : Download Bootstrap/jQuery into static/vendor (needs network)")
+    print(f"{APP_ID} assets --build         : Fingerprint & precompress static assets into static/dist")
+    print(f"{APP_ID} assets --prune         : Delete hashed assets superseded more than {PRUNE_AFTER_DAYS} days ago")
+
+# ---------------- Worker Count ----------------
+# Reads `--workers N` / `--workers auto` from the command line; None keeps the configured default.
+def parse_workers(args):
+    if "--workers" not in args:
+        return None
+    idx = args.index("--workers")
+    value = args[idx + 1] if idx + 1 < len(args) else ""
+    if value == "auto":
+        return os.cpu_count() or 1
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    print(Fore.RED + f"Invalid --workers value '{value}'. Use a positive number or 'auto'.")
+    sys.exit(1)
 
 # ---------------- Start Server ----------------
-def start_server():
+def start_server(workers=None):
     # ---- HTTP Server -----
     # If no PID file, launches the HTTP Server dashboard:
     if os.path.exists(PID_FILE):
         print(Fore.GREEN + f"{APP_NAME} Server already running. Stop it first with `{APP_ID} automate --stop`.")
     else:
+        # The worker count reaches WebRoutes.py through the environment (read in settings/constants.py).
+        env = os.environ.copy()
+        if workers:
+            env[f"{APP_ID.upper()}_WEB_WORKERS"] = str(workers)
+        # Detach from the terminal: a new process group on Windows, a new session on POSIX.
+        if os.name == "nt":
+            detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            detach = {"start_new_session": True}
         with open(LOG_FILES[HTTP_LOG_ID], "a") as log_file:
             # subprocess.Popen runs it detached so it survives terminal close.
             # Stdout/stderr redirected to the HTTP log.
@@ -54,11 +83,21 @@ def start_server():
                 ["python", str(WEBROUTES_PATH)],
                 stdout=log_file,
                 stderr=subprocess.STDOUT,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP  # better for Windows
+                env=env,
+                **detach
             )
+            # A busy port or a broken worker makes the server exit straight away; don't report that as started.
+            try:
+                process.wait(timeout=STARTUP_CHECK)
+                print(Fore.RED + f"{APP_NAME} Server exited during startup (code {process.returncode}). "
+                                 f"See {LOG_FILES[HTTP_LOG_ID]}")
+                return
+            except subprocess.TimeoutExpired:
+                pass
             with open(PID_FILE, "w") as f:
                 f.write(str(process.pid))
-            print(Fore.GREEN + f"{APP_NAME} Server started with PID {process.pid} at http://localhost:5999")
+            print(Fore.GREEN + f"{APP_NAME} Server started with PID {process.pid} at http://localhost:{WEB_PORT}"
+                  + (f" ({workers} workers)" if workers else ""))
 
     print(Fore.CYAN + "You can safely close the terminal. Both processes run in the background.")
 
@@ -72,9 +111,16 @@ def commands():
     if len(sys.argv) > 1 and sys.argv[1] == "--version":
         print( APP_VERSION )
     elif len(sys.argv) > 2 and sys.argv[1] == "automate" and sys.argv[2] == "--start":
-        start_server()
+        start_server(parse_workers(sys.argv[3:]))
     elif len(sys.argv) > 2 and sys.argv[1] == "automate" and sys.argv[2] == "--stop":
         stop_server()
+    elif len(sys.argv) > 2 and sys.argv[1] == "assets" and sys.argv[2] == "--fetch":
+        fetch_vendor_assets()
+    elif len(sys.argv) > 2 and sys.argv[1] == "assets" and sys.argv[2] == "--build":
+        build_assets()
+        print(Fore.GREEN + "Static assets built into static/dist")
+    elif len(sys.argv) > 2 and sys.argv[1] == "assets" and sys.argv[2] == "--prune":
+        print(Fore.GREEN + f"Removed {prune_assets()} superseded static files from static/dist")
     else:
         definition()
 
@@ -1,17 +1,18 @@
 import pyautogui
-import time
+from screenObserver import wait_until_stable
 
-def move(x, y):
+def move(x, y, duration=0.5):
     """
     Moves the mouse to (x, y) and clicks.
     
     :param x: X coordinate
     :param y: Y coordinate
+    :param duration: Seconds the movement takes (0 = teleport)
     :param clicks: Number of clicks
     :param interval: Delay between clicks
     :param button: 'left' or 'right'
     """
-    pyautogui.moveTo(x, y, duration=0.5)  # move smoothly in 0.5 seconds
+    pyautogui.moveTo(x, y, duration=duration)  # move smoothly in 0.5 seconds by default
 
 def click(clicks=1, interval=0.25, button='left'):
     """
@@ -32,7 +33,7 @@ def open_desktop_app(app_icon_coords):
     :param app_icon_coords: Tuple of (x, y) coordinates of the app icon
     """
     move(*app_icon_coords)
-    time.sleep(0.2)  # wait for app to open
+    wait_until_stable(timeout=0.2)  # wait for app to open, but no longer than the UI needs
 
 if __name__ == "__main__":
     # Example: move mouse to Notepad icon at (200, 500) and open it
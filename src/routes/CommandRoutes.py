@@ -18,7 +18,7 @@ import subprocess # to spawn new processes (starting server/listener).
 import os # general OS utilities (checking/removing files).
 
 from src.utils.PidFiles import stop_process
-from src.settings.constants import APP_ID, SERVICES_ROOT, RPI_ROOT
+from src.settings.constants import APP_ID, SERVICES_ROOT, RPI_ROOT, SPEECH_PID_FILE
 from src.utils.logger import HTTP_LOG_ID, STT_LOG_ID, LOG_FILES, log_message
 
 # Initializes colorama so Windows & Unix terminals handle color codes.
@@ -27,7 +27,6 @@ init(autoreset=True)
 
 # Scripts & PID files for Speech Listener Servers
 SPEECH_PATH = SERVICES_ROOT / "CommandListenerService.py"
-SPEECH_PID_FILE = RPI_ROOT / f"{APP_ID}-speech.pid"
 
 # ---------------- Start Server ----------------
 def start_server():
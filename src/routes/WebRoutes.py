@@ -1,10 +1,14 @@
 import os, time # general OS utilities (checking/removing files).
 from flask import Flask
 from waitress import serve
-from src.settings.constants import PROJECT_ROOT
+from src.settings.constants import PROJECT_ROOT, WEB_HOST, WEB_PORT, WEB_THREADS, WEB_CONNECTION_LIMIT, WEB_CHANNEL_TIMEOUT, WEB_BACKLOG, WEB_WORKERS
 from src.controller.DashboardController import dashboard_bp
 from src.controller.CommandListenerController import commandListener_bp
 from src.controller.VFController import vf_bp
+from src.controller.TranscriptController import transcript_bp
+from src.controller.DebugController import debug_bp
+from src.utils.PreforkServer import run_prefork
+from src.utils.StaticAssets import init_static_assets
 
 app = Flask(__name__,
             template_folder=os.path.join(PROJECT_ROOT, "templates"),
@@ -14,6 +18,22 @@ app = Flask(__name__,
 app.register_blueprint(dashboard_bp)
 app.register_blueprint(commandListener_bp)
 app.register_blueprint(vf_bp)
+app.register_blueprint(transcript_bp)
+app.register_blueprint(debug_bp)
+
+# fingerprinted, precompressed static files behind url_for('static')
+init_static_assets(app)
 
 if __name__ == "__main__":
-    serve(app, host="0.0.0.0", port=5999)
+    if WEB_WORKERS > 1:
+        # One waitress server per worker process, all sharing this process's listening socket.
+        run_prefork("src.routes.WebRoutes:app", WEB_WORKERS)
+    else:
+        # Concurrency is configurable (see settings/constants.py); heavy routes are admission-controlled (utils/HeavyExecutor.py).
+        serve(app,
+              host=WEB_HOST,
+              port=WEB_PORT,
+              threads=WEB_THREADS,
+              connection_limit=WEB_CONNECTION_LIMIT,
+              channel_timeout=WEB_CHANNEL_TIMEOUT,
+              backlog=WEB_BACKLOG)
@@ -0,0 +1,206 @@
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+# Frames are compared as small grayscale arrays: cheap to grab, diff and store.
+DEFAULT_SCALE = 0.25            # downscale factor applied to every captured frame
+DEFAULT_INTERVAL = 0.03         # seconds between live captures (~30 fps)
+DEFAULT_THRESHOLD = 0.01        # mean absolute difference (0..1) below which two frames are "the same"
+DEFAULT_STABLE_FOR = 0.15       # seconds without change that count as "settled"
+
+
+def to_frame(image, scale=DEFAULT_SCALE):
+    """
+    Converts a PIL image to a low-resolution grayscale frame.
+
+    :param image: PIL.Image (screenshot or image loaded from disk)
+    :param scale: Downscale factor (0.25 = quarter width/height)
+    :return: 2-D float32 numpy array with values in 0..1
+    """
+    image = image.convert("L")
+    if scale != 1:
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        image = image.resize(size, Image.BILINEAR)
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def frame_diff(a, b):
+    """Mean absolute difference between two frames (0 = identical, 1 = inverted)."""
+    if a.shape != b.shape:
+        return 1.0
+    return float(np.mean(np.abs(a - b)))
+
+
+class LiveFrames:
+    """
+    Captures frames from the screen with pyautogui.
+
+    :param region: (left, top, width, height) to watch, or None for the whole screen
+    :param scale: Downscale factor
+    :param interval: Minimum time between captures
+    """
+    exhausted = False   # live capture never runs out of frames
+
+    def __init__(self, region=None, scale=DEFAULT_SCALE, interval=DEFAULT_INTERVAL):
+        import pyautogui  # imported here so recorded frames work on machines without a display
+        self._pyautogui = pyautogui
+        self.region = region
+        self.scale = scale
+        self.interval = interval
+        self._last = None
+
+    def clock(self):
+        return time.monotonic()
+
+    def __call__(self):
+        if self._last is not None:
+            remaining = self.interval - (time.monotonic() - self._last)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last = time.monotonic()
+        return to_frame(self._pyautogui.screenshot(region=self.region), self.scale)
+
+
+class RecordedFrames:
+    """
+    Replays a recorded frame sequence (for offline tests). Time is virtual: each frame advances the clock by
+    interval, so timeouts behave as they would have live, and the sequence ends once every frame was returned.
+
+    :param frames: List of frames, or a directory of PNGs written by record_frames()
+    :param scale: Downscale factor used when loading PNGs
+    :param interval: Seconds between the recorded frames
+    """
+    def __init__(self, frames, scale=DEFAULT_SCALE, interval=DEFAULT_INTERVAL):
+        if isinstance(frames, (str, os.PathLike)):
+            names = sorted(n for n in os.listdir(frames) if n.lower().endswith(".png"))
+            frames = [to_frame(Image.open(os.path.join(frames, n)), scale) for n in names]
+        if not frames:
+            raise ValueError("RecordedFrames needs at least one frame")
+        self.frames = list(frames)
+        self.interval = interval
+        self.index = 0
+
+    @property
+    def exhausted(self):
+        return self.index >= len(self.frames)
+
+    def clock(self):
+        return self.index * self.interval
+
+    def __call__(self):
+        if self.exhausted:
+            raise IndexError("RecordedFrames sequence is exhausted")
+        frame = self.frames[self.index]
+        self.index += 1
+        return frame
+
+
+def record_frames(output_dir, duration=2.0, region=None, interval=DEFAULT_INTERVAL):
+    """
+    Saves screenshots of a region as numbered PNGs, for replay with RecordedFrames.
+
+    :param output_dir: Folder to write frame_0000.png, frame_0001.png, ...
+    :param duration: Seconds to record
+    :param region: (left, top, width, height) or None for the whole screen
+    :param interval: Seconds between captures
+    :return: Number of frames written
+    """
+    import pyautogui
+    os.makedirs(output_dir, exist_ok=True)
+    count = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        pyautogui.screenshot(region=region).save(os.path.join(output_dir, f"frame_{count:04d}.png"))
+        count += 1
+        time.sleep(interval)
+    return count
+
+
+def _keep_waiting(source, deadline, seen, max_frames):
+    # Sources share one notion of time (wall clock live, frame count x interval recorded).
+    return not source.exhausted and source.clock() < deadline and (max_frames is None or seen < max_frames)
+
+
+def wait_until_stable(region=None, timeout=2.0, threshold=DEFAULT_THRESHOLD, stable_for=DEFAULT_STABLE_FOR,
+                      change_timeout=0.5, source=None, max_frames=None):
+    """
+    Waits until the screen (or a region) has changed and then stopped changing.
+
+    First waits up to change_timeout for any change (an action may take a moment to show up;
+    if nothing changes the UI is taken as already settled), then waits until consecutive frames
+    have differed by less than threshold for stable_for seconds.
+
+    :param region: (left, top, width, height) or None for the whole screen
+    :param timeout: Maximum seconds to wait overall (recorded sources also stop when they run out of frames)
+    :param threshold: Frame difference treated as "no change"
+    :param stable_for: Seconds the screen must stay unchanged (independent of how fast frames are captured)
+    :param change_timeout: Seconds to wait for the first change (0 = don't wait for one)
+    :param source: Frame source callable (LiveFrames / RecordedFrames); defaults to live capture
+    :param max_frames: Optional frame budget on top of timeout (None = unlimited)
+    :return: True if the screen settled, False on timeout
+    """
+    source = source or LiveFrames(region)
+    start = source.clock()
+    deadline = start + timeout
+    baseline = previous = source()
+    seen = 1
+    changed = change_timeout <= 0
+    still_since = source.clock()
+    while _keep_waiting(source, deadline, seen, max_frames):
+        frame = source()
+        seen += 1
+        if not changed:
+            changed = frame_diff(frame, baseline) >= threshold
+            if not changed and source.clock() - start >= change_timeout:
+                return True
+            previous = frame
+            still_since = source.clock()
+            continue
+        if frame_diff(frame, previous) >= threshold:
+            still_since = source.clock()
+        elif source.clock() - still_since >= stable_for:
+            return True
+        previous = frame
+    # Nothing changed before time (or the recording) ran out: the UI was already settled.
+    return not changed
+
+
+def wait_until_matches(expected, region=None, timeout=5.0, threshold=0.05, scale=DEFAULT_SCALE,
+                       source=None, max_frames=None):
+    """
+    Waits until the screen (or a region) looks like an expected image.
+
+    :param expected: Path to a PNG of the expected state, a PIL image, or a frame
+    :param region: (left, top, width, height) matching the expected image, or None
+    :param timeout: Maximum seconds to wait (recorded sources also stop when they run out of frames)
+    :param threshold: Maximum frame difference counted as a match
+    :param scale: Downscale factor (must match the source's)
+    :param source: Frame source callable; defaults to live capture
+    :param max_frames: Optional frame budget on top of timeout (None = unlimited)
+    :return: True if matched, False on timeout
+    """
+    if isinstance(expected, (str, os.PathLike)):
+        expected = Image.open(expected)
+    if isinstance(expected, Image.Image):
+        expected = to_frame(expected, scale)
+    source = source or LiveFrames(region, scale)
+    deadline = source.clock() + timeout
+    seen = 0
+    while _keep_waiting(source, deadline, seen, max_frames):
+        seen += 1
+        if frame_diff(source(), expected) <= threshold:
+            return True
+    return False
+
+
+if __name__ == "__main__":
+    # Offline demo: a UI that animates for a few frames and then settles.
+    rest = np.zeros((20, 20), dtype=np.float32)
+    moving = [np.full((20, 20), v, dtype=np.float32) for v in (0.2, 0.4, 0.6, 0.8)]
+    settled = np.ones((20, 20), dtype=np.float32)
+    frames = RecordedFrames([rest, rest] + moving + [settled] * 8)
+    print("Settled:", wait_until_stable(source=frames), "after", frames.index, "frames")
+    print("Matched:", wait_until_matches(settled, source=RecordedFrames([rest, settled])))
+    print("Timed out:", not wait_until_matches(settled, timeout=0.1, source=RecordedFrames([rest] * 10 + [settled])))
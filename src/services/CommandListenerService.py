@@ -4,9 +4,11 @@
 ##      CommandListenerService.py:                                                                                          ##
 ##      ------------------------------------------------                                                                    ##
 ##          1) Captures live audio from a system or microphone.                                                             ##
-##          2) Queues audio frames from the sounddevice callback.                                                           ##
-##          3) Feeds them to Vosk for real-time transcription.                                                              ##
+##          2) Queues audio frames (device's native rate & channels) from the sounddevice callback.                         ##
+##          3) Downmixes/resamples them to 16 kHz mono and feeds them to Vosk for real-time transcription.                  ##
 ##          4) Logs recognized text through your own log_message system.                                                    ##
+##          5) Stores each utterance (timestamp, device id, confidence) in the searchable transcript database.              ##
+##          6) Speaks cached acknowledgements for known phrases through TextToSpeechService.                                ##
 ##                                                                                                                          ##
 ##############################################################################################################################
 
@@ -19,6 +21,11 @@ import vosk # offline speech-to-text engine.
 import json # parse recognizer output.
 import numpy as np # audio arrays from sounddevice.
 from src.utils.logger import STT_LOG_ID, log_message # Our own helper to write logs (tagged with STT_LOG_ID).
+from src.utils.TranscriptStore import TranscriptWriter # batched writes into the SQLite/FTS transcript store.
+from src.utils.Profiler import watch_commands # on-demand profiling requested from the dashboard.
+from src.utils.AudioResample import CaptureConverter # native-rate capture -> 16 kHz mono PCM for Vosk.
+from src.settings.constants import VOICE_ACKNOWLEDGEMENTS, TTS_CACHE_SIZE
+from src.services.TextToSpeechService import TextToSpeechService # cached spoken acknowledgements.
 
 
 class CommandListenerService:
@@ -26,10 +33,14 @@ class CommandListenerService:
     # model_path – folder containing the Vosk model files.
     # sample_rate – audio sampling rate (16 kHz is standard for speech)
     # self.q – a queue.Queue() for passing audio chunks from the audio callback to the recognizer.
-    def __init__(self, model_path, sample_rate=16000):
+    # responder – optional TextToSpeechService used to acknowledge known phrases.
+    def __init__(self, model_path, sample_rate=16000, responder=None):
         self.model_path = model_path
         self.sample_rate = sample_rate
+        self.responder = responder
         self.q = queue.Queue()
+        self.device_id = None
+        self.converter = None
 
         try:
             # Loads the acoustic/language model.
@@ -40,36 +51,50 @@ class CommandListenerService:
 
         # Creates a Kaldi-based recognizer that will accept audio frames and output text.
         self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
+        # Per-word results carry a "conf" score; their mean is stored as the utterance confidence.
+        self.recognizer.SetWords(True)
 
     # This is automatically called by sounddevice.InputStream whenever a new block of audio arrives.
     def _callback(self, indata, frames, time, status):
-        """Collect audio data in a queue (force mono if multi-channel)"""
+        """Collect audio data in a queue (all channels, native rate)"""
         if status:
             # Logs any driver/stream status messages.
             log_message(STT_LOG_ID, f" Status: {status}")
-        # Ensures mono audio (speech recognizer expects 1 channel).
-        # Take only the first channel
-        if indata.ndim > 1:
-            indata = indata[:, 0]
-        # Places raw bytes of audio into the queue for the recognizer loop.
-        self.q.put(bytes(indata))
+        # Keep the audio thread cheap: copy the block (sounddevice reuses the buffer) and let the
+        # recognizer loop do the downmix/resample.
+        self.q.put(indata.copy())
 
     # -------------------------------------
     # _recognize_loop runs forever:
     # -------------------------------------
     #   1. Pulls audio chunks from the queue.
-    #   2. Feeds them to the recognizer.
+    #   2. Converts them to 16 kHz mono int16 and feeds them to the recognizer, except while our own
+    #       spoken reply is playing (Stereo Mix would capture and transcribe it).
     #   3. When Vosk thinks it has a complete utterance (AcceptWaveform returns True), it parses 
-    #       the JSON and logs the recognized text.
-    def _recognize_loop(self):
+    #       the JSON, logs the recognized text and queues it for the transcript store.
+    def _recognize_loop(self, transcripts):
         """Internal recognition loop"""
+        muted = False
         while True:
-            data = self.q.get()
+            data = self.converter.process(self.q.get())
+            if self.responder is not None and self.responder.is_speaking():
+                if not muted:
+                    # Drop the partial utterance too, so the reply isn't glued onto the next one.
+                    self.recognizer.Reset()
+                    muted = True
+                continue
+            muted = False
             if self.recognizer.AcceptWaveform(data):
                 result = json.loads(self.recognizer.Result())
                 text = result.get("text")
                 if text:
                     log_message(STT_LOG_ID, f" Recognized:"+ str(text))
+                    words = result.get("result") or []
+                    confidence = sum(w.get("conf", 0.0) for w in words) / len(words) if words else None
+                    transcripts.add(text, device_id=self.device_id, confidence=confidence)
+                    # Replies are pre-rendered, so the worker starts playback without a synthesis delay.
+                    if self.responder is not None and text in VOICE_ACKNOWLEDGEMENTS:
+                        self.responder.say(VOICE_ACKNOWLEDGEMENTS[text])
 
     # ------------------------------------
     # list_input_devices:
@@ -108,40 +133,54 @@ class CommandListenerService:
 
     def listen_from_device(self, device_id):
         """Listen from a chosen input device"""
+        transcripts = TranscriptWriter()
         try:
             device_info = sd.query_devices(device_id)
-            # Checks the chosen device and forces it to 1 channel.
-            channels = min(device_info["max_input_channels"], 1)  # Force mono
+            # Captures at the device's own rate and channel count, so the host audio stack
+            # doesn't resample or drop channels; we downmix/resample to 16 kHz mono ourselves.
+            channels = device_info["max_input_channels"]
             if channels < 1:
                 raise RuntimeError(f"Device {device_id} does not have input channels.")
+            capture_rate = int(device_info["default_samplerate"])
 
-            log_message(STT_LOG_ID, f" Listening to device {device_id} ({device_info['name']}) with {channels} channel(s)")
+            self.device_id = device_id
+            self.converter = CaptureConverter(capture_rate, self.sample_rate)
+            log_message(STT_LOG_ID, f" Listening to device {device_id} ({device_info['name']}) with {channels} channel(s) at {capture_rate} Hz")
 
             # Opens a live input stream:
-            #   1) 16 kHz sample rate.
-            #   2) blocksize=8000 means it hands over roughly 0.5 s chunks at a time.
-            #   3) dtype="int16" keeps it compatible with Vosk.
+            #   1) native sample rate.
+            #   2) blocksize of half the rate hands over roughly 0.5 s chunks at a time.
+            #   3) dtype="float32" keeps full precision for the downmix/resample (converted to int16 for Vosk).
             #   4) Calls _callback each time audio arrives.
             # While the stream is open, _recognize_loop() continuously processes and logs text.
             with sd.InputStream(
-                samplerate=self.sample_rate,
-                blocksize=8000,
+                samplerate=capture_rate,
+                blocksize=capture_rate // 2,
                 device=device_id,
                 channels=channels,
-                dtype="int16",
+                dtype="float32",
                 latency="low",
                 callback=self._callback
             ):
-                self._recognize_loop()
+                self._recognize_loop(transcripts)
 
         except Exception as e:
             # Graceful error handling if the stream can’t open.
             log_message(STT_LOG_ID, f" Could not start listening: {e}")
+        finally:
+            # Commits any utterances still waiting for a batch.
+            transcripts.close()
 
 
 if __name__ == "__main__":
+    # Starts the TTS worker and renders the acknowledgement phrases while the model loads.
+    responder = TextToSpeechService(cache_size=TTS_CACHE_SIZE)
+    responder.prerender(VOICE_ACKNOWLEDGEMENTS.values())
+
     # When run directly, creates a listener using a specific Vosk model folder.
-    listener = CommandListenerService("model/vosk-model-small-en-us-0.15")
+    listener = CommandListenerService("model/vosk-model-small-en-us-0.15", responder=responder)
+    # Lets /debug/profile/* and /debug/memory/* (target=speech) profile this process.
+    watch_commands("speech")
 
     # Try auto-select Stereo Mix
     # First tries to grab “Stereo Mix” automatically for system-wide audio.
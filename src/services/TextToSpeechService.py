@@ -0,0 +1,161 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      TextToSpeechService.py:                                                                                             ##
+##      ------------------------------------------------                                                                    ##
+##          1) Owns the pyttsx3 engine and audio playback on one dedicated worker thread (neither pyttsx3 nor sd.play is    ##
+##             thread-safe).                                                                                                ##
+##          2) Renders phrases to in-memory audio buffers (via a temporary WAV) and keeps them in an LRU cache keyed by     ##
+##             (text, voice).                                                                                               ##
+##          3) say() only enqueues; the worker plays cached phrases straight away and renders + caches the others first.    ##
+##          4) prerender() warms the cache at service start so acknowledgements have no synthesis delay.                    ##
+##          5) is_speaking() tells the speech listener when a reply is queued or playing, so it can ignore its own voice.   ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import os # general OS utilities (checking/removing files).
+import queue # jobs for the TTS worker thread.
+import tempfile # pyttsx3 renders to a file; we read it back into memory.
+import threading # dedicated worker thread + cache lock.
+import time # end of the last reply (echo tail).
+import wave # reads the rendered WAV.
+from collections import OrderedDict # LRU cache.
+import numpy as np # audio buffers.
+import sounddevice as sd # plays the cached buffers.
+import pyttsx3 # offline text-to-speech engine.
+from src.utils.logger import STT_LOG_ID, log_message # Our own helper to write logs (tagged with STT_LOG_ID).
+
+# Seconds after playback ends that still count as speaking (output/capture latency, room echo).
+ECHO_TAIL = 0.5
+
+
+class TextToSpeechService:
+    # cache_size – number of rendered phrases kept (least recently used are evicted).
+    # voice – pyttsx3 voice id (None = system default); part of the cache key.
+    # rate – speaking rate in words per minute (None = engine default).
+    def __init__(self, cache_size=64, voice=None, rate=None):
+        self.cache_size = cache_size
+        self.voice = voice
+        self.rate = rate
+        self._cache = OrderedDict()     # (text, voice) -> (samples, sample_rate)
+        self._lock = threading.Lock()
+        self._pending = 0               # say() jobs queued or playing
+        self._quiet_after = 0.0         # monotonic time the last reply (plus echo tail) ends
+        self._alive = True              # False once the worker has exited (e.g. no TTS driver)
+        self.q = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="tts-worker", daemon=True)
+        self._thread.start()
+
+    # ---------------- Cache ----------------
+    def _get(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _put(self, key, audio):
+        with self._lock:
+            self._cache[key] = audio
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---------------- Public API ----------------
+    def say(self, text):
+        """Queue text to be spoken (rendered first if it is not cached); never blocks. No-op without a worker."""
+        with self._lock:
+            if not self._alive:
+                return
+            self._pending += 1
+            self.q.put(("say", text))
+
+    def is_speaking(self):
+        """True while a reply is queued, playing, or within ECHO_TAIL of finishing."""
+        with self._lock:
+            if not self._alive:
+                return False
+            return self._pending > 0 or time.monotonic() < self._quiet_after
+
+    def prerender(self, texts):
+        """Queue phrases for rendering so later say() calls are cache hits."""
+        for text in texts:
+            self.q.put(("render", text))
+
+    def close(self):
+        if self._thread.is_alive():
+            self.q.put(None)
+        self._thread.join()
+
+    # ---------------- Worker ----------------
+    def _worker(self):
+        try:
+            # The engine is created here so every pyttsx3 call happens on this thread.
+            engine = pyttsx3.init()
+            if self.voice:
+                engine.setProperty("voice", self.voice)
+            if self.rate:
+                engine.setProperty("rate", self.rate)
+        except Exception as e:
+            log_message(STT_LOG_ID, f" TTS unavailable, spoken replies disabled: {e}")
+            self._shutdown()
+            return
+        try:
+            self._serve(engine)
+        finally:
+            self._shutdown()
+            engine.stop()
+
+    def _serve(self, engine):
+        while True:
+            job = self.q.get()
+            if job is None:
+                break
+            action, text = job
+            key = (text, self.voice)
+            try:
+                audio = self._get(key)
+                if audio is None:
+                    audio = self._render(engine, text)
+                    self._put(key, audio)
+                if action == "say":
+                    self._play(audio)
+            except Exception as e:
+                log_message(STT_LOG_ID, f" TTS failed for '{text}': {e}")
+            finally:
+                if action == "say":
+                    with self._lock:
+                        self._pending -= 1
+                        self._quiet_after = time.monotonic() + ECHO_TAIL
+
+    def _shutdown(self):
+        # say() checks _alive and enqueues under the same lock, so nothing is queued after this drain.
+        with self._lock:
+            self._alive = False
+            while True:
+                try:
+                    job = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None and job[0] == "say":
+                    self._pending -= 1
+
+    def _render(self, engine, text):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with wave.open(path, "rb") as wav:
+                frames = wav.readframes(wav.getnframes())
+                dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[wav.getsampwidth()]
+                samples = np.frombuffer(frames, dtype=dtype).reshape(-1, wav.getnchannels())
+                return samples, wav.getframerate()
+        finally:
+            os.remove(path)
+
+    def _play(self, audio):
+        # Only ever called on the worker; waiting here keeps replies from cutting each other off.
+        samples, sample_rate = audio
+        sd.play(samples, sample_rate)
+        sd.wait()
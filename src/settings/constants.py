@@ -21,4 +21,50 @@ ROUTE_ROOT = PROJECT_ROOT / "src" / "routes"
 CONTROLLER_ROOT = PROJECT_ROOT / "src" / "controller"
 SERVICES_ROOT = PROJECT_ROOT / "src" / "services"
 RPI_ROOT = PROJECT_ROOT / "rpi"
-LOG_DIR = PROJECT_ROOT / "logs"
\ No newline at end of file
+SPEECH_PID_FILE = RPI_ROOT / f"{APP_ID}-speech.pid"
+LOG_DIR = PROJECT_ROOT / "logs"
+DATA_DIR = PROJECT_ROOT / "data"
+TRANSCRIPT_DB = DATA_DIR / f"{APP_ID}-transcripts.db"
+
+# ---------------- Environment Overrides ----------------
+# Reads an integer setting from the environment (e.g. IWLAB_WEB_THREADS=16), falling back to the default.
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(f"{APP_ID.upper()}_{name}", default))
+    except ValueError:
+        return default
+
+# ---------------- Web Server (waitress) ----------------
+WEB_HOST = os.environ.get(f"{APP_ID.upper()}_WEB_HOST", "0.0.0.0")
+WEB_PORT = _env_int("WEB_PORT", 5999)
+WEB_THREADS = _env_int("WEB_THREADS", 8)                     # waitress worker threads (shared by every route)
+WEB_CONNECTION_LIMIT = _env_int("WEB_CONNECTION_LIMIT", 100) # max simultaneous open connections
+WEB_CHANNEL_TIMEOUT = _env_int("WEB_CHANNEL_TIMEOUT", 120)   # seconds an inactive connection is kept
+WEB_BACKLOG = _env_int("WEB_BACKLOG", 1024)                  # listen() backlog for pending connections
+
+# ---------------- Pre-fork Mode ----------------
+# WEB_WORKERS > 1 serves the dashboard from several processes (see utils/PreforkServer.py).
+WEB_WORKERS = _env_int("WEB_WORKERS", 1)
+WEB_MAX_REQUESTS = _env_int("WEB_MAX_REQUESTS", 1000)        # recycle a worker after this many requests (0 = never)
+WEB_MAX_MEMORY_MB = _env_int("WEB_MAX_MEMORY_MB", 512)       # recycle a worker above this RSS (0 = never)
+
+# ---------------- Heavy Endpoint Executor ----------------
+# Slow handlers (uploads, starting services) are admission-controlled so the waitress threads stay free
+# for light routes. HEAVY_WORKERS + HEAVY_QUEUE_DEPTH is clamped to WEB_THREADS - 1 (see utils/HeavyExecutor.py).
+HEAVY_WORKERS = _env_int("HEAVY_WORKERS", 2)                 # heavy requests executing at once
+HEAVY_QUEUE_DEPTH = _env_int("HEAVY_QUEUE_DEPTH", 2)         # heavy requests allowed to wait for a worker
+HEAVY_RETRY_AFTER = _env_int("HEAVY_RETRY_AFTER", 5)         # seconds sent in Retry-After on a 503
+
+# ---------------- Video Encoding ----------------
+# "auto" picks preview / archival from CPU load and running encodes (see utils/VFUtils.py);
+# "audio-only" drops the video track and is only used when set explicitly.
+ENCODE_PROFILE = os.environ.get(f"{APP_ID.upper()}_ENCODE_PROFILE", "auto")
+
+# ---------------- Spoken Acknowledgements ----------------
+# Recognized phrase -> reply spoken by the speech listener. Replies are pre-rendered into the TTS cache at start.
+VOICE_ACKNOWLEDGEMENTS = {
+    "hello": "Hello, I am listening",
+    "are you there": "Yes, I am here",
+    "status": "Speech listener is running",
+}
+TTS_CACHE_SIZE = _env_int("TTS_CACHE_SIZE", 64)             # rendered phrases kept in memory
@@ -0,0 +1,179 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      AudioResample.py:                                                                                                   ##
+##      ------------------------------------------------                                                                    ##
+##         1) PolyphaseResampler: streaming rational resampler (e.g. 48 kHz / 44.1 kHz -> 16 kHz) with a Kaiser-windowed    ##
+##            sinc filter; each block is one vectorized NumPy gather + multiply-sum, with no per-sample Python loop.        ##
+##         2) Downmixer: multi-channel -> mono. Uses mid (L+R)/2 normally, but switches (with hysteresis) to the louder     ##
+##            channel when the side signal dominates, so anti-phase or one-sided content doesn't cancel or halve.           ##
+##         3) CaptureConverter: downmix + resample + int16 bytes, i.e. what the Vosk recognizer expects.                    ##
+##         4) Run as a module for accuracy/CPU benchmarks against the old path (first channel only, cheap resampling).      ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import sys # command-line arguments for the benchmark.
+import time # benchmark timing.
+from math import gcd
+import numpy as np # vectorized DSP.
+
+ZERO_CROSSINGS = 16     # sinc zero crossings per side at the lower rate (quality vs CPU)
+KAISER_BETA = 8.6       # ~90 dB stop-band attenuation
+CUTOFF = 0.9            # pass-band edge as a fraction of the output Nyquist
+
+
+# ---------------- Polyphase Resampler ----------------
+class PolyphaseResampler:
+    # Streaming: keeps taps-1 input samples of history and its output position across blocks,
+    # so consecutive blocks join without clicks.
+    def __init__(self, in_rate, out_rate, zero_crossings=ZERO_CROSSINGS):
+        g = gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // g
+        self.down = int(in_rate) // g
+        # Taps per polyphase branch: the prototype spans 2 * zero_crossings periods of the lower rate.
+        self.taps = -(-2 * zero_crossings * max(self.up, self.down) // self.up)
+        self.in_rate = int(in_rate)
+        self.bank = self._design_bank()
+        self._hist = np.zeros(self.taps - 1, dtype=np.float32)
+        self._n_in = 0
+        self._n_out = 0
+
+    @property
+    def delay_seconds(self):
+        """Group delay of the filter (half its length at the upsampled rate)."""
+        return (self.taps * self.up - 1) / 2 / (self.up * self.in_rate)
+
+    def _design_bank(self):
+        # Low-pass prototype at the upsampled rate (in_rate * up), split into `up` phases.
+        length = self.taps * self.up
+        fc = CUTOFF * 0.5 / max(self.up, self.down)
+        m = np.arange(length) - (length - 1) / 2
+        h = 2 * fc * np.sinc(2 * fc * m) * np.kaiser(length, KAISER_BETA)
+        h *= self.up / h.sum()      # unity DC gain after zero-stuffing by `up`
+        # bank[phase, k] = h[phase + k * up]
+        return h.reshape(self.taps, self.up).T.astype(np.float32)
+
+    def process(self, x):
+        """Resample a 1-D float block; returns however many output samples are now complete."""
+        x = np.asarray(x, dtype=np.float32)
+        buf = np.concatenate([self._hist, x])
+        base = self._n_in - (self.taps - 1)            # global input index of buf[0]
+        total = self._n_in + len(x)
+        n_end = (total * self.up + self.down - 1) // self.down
+        n = np.arange(self._n_out, n_end, dtype=np.int64)
+        pos = n * self.down
+        i = pos // self.up                             # newest input sample used by each output
+        phase = pos % self.up
+        idx = (i - base)[:, None] - np.arange(self.taps)[None, :]
+        y = np.einsum("nk,nk->n", self.bank[phase], buf[idx])
+        self._n_out = n_end
+        self._n_in = total
+        self._hist = buf[len(buf) - (self.taps - 1):]
+        return y
+
+
+# ---------------- Downmix ----------------
+class Downmixer:
+    # Ratio = max(side/mid energy, louder/quieter channel energy).
+    RATIO_ON = 4.0          # switch to single-channel mode above this
+    RATIO_OFF = 2.0         # switch back to mid below this (hysteresis avoids flapping)
+
+    def __init__(self):
+        self.single_channel = False
+
+    def process(self, block):
+        """(frames, channels) float block -> (frames,) mono."""
+        if block.ndim == 1 or block.shape[1] == 1:
+            return block.reshape(-1)
+        if block.shape[1] > 2:
+            return block.mean(axis=1)
+        left, right = block[:, 0], block[:, 1]
+        mid = (left + right) * 0.5
+        side = (left - right) * 0.5
+        eps = 1e-12
+        left_energy, right_energy = float(np.dot(left, left)) + eps, float(np.dot(right, right)) + eps
+        ratio = max(float(np.dot(side, side)) / (float(np.dot(mid, mid)) + eps),
+                    max(left_energy, right_energy) / min(left_energy, right_energy))
+        if self.single_channel and ratio < self.RATIO_OFF:
+            self.single_channel = False
+        elif not self.single_channel and ratio > self.RATIO_ON:
+            self.single_channel = True
+        if self.single_channel:
+            # Anti-phase or one-sided audio: the louder channel keeps the speech mid would cancel/halve.
+            return left if left_energy >= right_energy else right
+        return mid
+
+
+# ---------------- Capture -> Recognizer ----------------
+class CaptureConverter:
+    # Turns native-rate, native-channel capture blocks into 16-bit mono PCM at the recognizer's rate.
+    def __init__(self, in_rate, out_rate=16000):
+        self.downmixer = Downmixer()
+        self.resampler = None if int(in_rate) == int(out_rate) else PolyphaseResampler(in_rate, out_rate)
+
+    def process(self, block):
+        """float32 block in -1..1 (frames, channels) -> int16 mono bytes."""
+        mono = self.downmixer.process(np.asarray(block, dtype=np.float32))
+        if self.resampler is not None:
+            mono = self.resampler.process(mono)
+        return (np.clip(mono, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+# ---------------- Benchmark ----------------
+def _legacy_path(block, in_rate, out_rate):
+    # Old behaviour: first channel only, then a cheap (linear) rate conversion like a driver would do.
+    first = block[:, 0]
+    t_out = np.arange(int(len(first) * out_rate / in_rate)) * in_rate / out_rate
+    return np.interp(t_out, np.arange(len(first)), first).astype(np.float32)
+
+def _snr_db(reference, signal, skip):
+    # Error against the ideal output, ignoring the filter warm-up at the start.
+    length = min(len(reference), len(signal))
+    reference, signal = reference[skip:length], signal[skip:length]
+    noise = signal - reference
+    return 10 * np.log10(np.dot(reference, reference) / (np.dot(noise, noise) + 1e-20))
+
+def _test_signal(rate, seconds, delay=0.0):
+    # Speech-band tones (300-3400 Hz) plus out-of-band content (9-15 kHz) that must not alias into 0-8 kHz.
+    t = np.arange(int(rate * seconds)) / rate - delay
+    speech = sum(0.1 * np.sin(2 * np.pi * f * t) for f in (300, 850, 1700, 3400))
+    alias = sum(0.05 * np.sin(2 * np.pi * f * t) for f in (9000, 12000, 15000) if f < rate / 2)
+    return speech, alias
+
+def run_benchmark(in_rate=48000, out_rate=16000, seconds=10, block_seconds=0.5):
+    speech_in, alias_in = _test_signal(in_rate, seconds)
+    filter_delay = PolyphaseResampler(in_rate, out_rate).delay_seconds
+    cases = {
+        # Same content on both channels (typical Stereo Mix).
+        "centered": np.stack([speech_in + alias_in, speech_in + alias_in], axis=1),
+        # Speech only on the right channel: the old path hears nothing.
+        "right-only": np.stack([alias_in, speech_in + alias_in], axis=1),
+        # Channels in anti-phase: a plain (L+R)/2 downmix would cancel the speech.
+        "anti-phase": np.stack([speech_in + alias_in, -(speech_in + alias_in)], axis=1),
+    }
+    block = int(in_rate * block_seconds)
+    print(f"{in_rate} Hz stereo -> {out_rate} Hz mono, {seconds}s test signal, {block_seconds}s blocks")
+    print(f"{'case':<12} {'path':<10} {'SNR (dB)':>9} {'CPU ms / audio s':>17}")
+    for name, audio in cases.items():
+        audio = audio.astype(np.float32)
+        for path in ("legacy", "polyphase"):
+            out, converter = [], CaptureConverter(in_rate, out_rate)
+            start = time.perf_counter()
+            for offset in range(0, len(audio), block):
+                chunk = audio[offset:offset + block]
+                if path == "legacy":
+                    out.append(_legacy_path(chunk, in_rate, out_rate))
+                else:
+                    mono = converter.downmixer.process(chunk)
+                    out.append(converter.resampler.process(mono) if converter.resampler else mono)
+            elapsed = time.perf_counter() - start
+            out = np.concatenate(out)
+            # Ideal output: the speech tones alone, sampled at out_rate (shifted by the filter delay for polyphase).
+            reference, _ = _test_signal(out_rate, seconds, 0.0 if path == "legacy" else filter_delay)
+            snr = _snr_db(reference.astype(np.float32), out, skip=out_rate // 100)
+            print(f"{name:<12} {path:<10} {snr:>9.1f} {elapsed * 1000 / seconds:>17.2f}")
+
+
+if __name__ == "__main__":
+    # python -m src.utils.AudioResample [in_rate]   e.g. 48000 or 44100
+    run_benchmark(in_rate=int(sys.argv[1]) if len(sys.argv) > 1 else 48000)
@@ -0,0 +1,65 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      HeavyExecutor.py:                                                                                                   ##
+##      ------------------------------------------------                                                                    ##
+##         1) Admission control for slow Flask handlers (uploads, service start/stop): at most HEAVY_WORKERS run at once    ##
+##            and HEAVY_QUEUE_DEPTH wait for a turn; anything beyond that is rejected straight away with 503 + Retry-After. ##
+##         2) Handlers run on the waitress thread that accepted them, so running + waiting heavy requests each hold one     ##
+##            waitress thread. Their total is clamped to WEB_THREADS - 1 at startup.                                       ##
+##         3) Light routes ("/", "/index", ...) therefore always find a free waitress thread.                               ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import threading # semaphores used for admission control.
+from functools import wraps # keeps the view function name (Flask endpoint names depend on it).
+from flask import jsonify
+from src.settings.constants import HEAVY_WORKERS, HEAVY_QUEUE_DEPTH, HEAVY_RETRY_AFTER, WEB_THREADS
+from src.utils.logger import log_message, HTTP_LOG_ID
+
+# ---------------- Limits ----------------
+# Every admitted heavy request holds a waitress thread; keep at least one for light routes.
+_max_admitted = max(1, min(HEAVY_WORKERS + HEAVY_QUEUE_DEPTH, WEB_THREADS - 1))
+_max_running = max(1, min(HEAVY_WORKERS, _max_admitted))
+if _max_admitted < HEAVY_WORKERS + HEAVY_QUEUE_DEPTH:
+    log_message(HTTP_LOG_ID, f"HEAVY_WORKERS + HEAVY_QUEUE_DEPTH ({HEAVY_WORKERS} + {HEAVY_QUEUE_DEPTH}) must stay below "
+                             f"WEB_THREADS ({WEB_THREADS}); clamped to {_max_running} running, {_max_admitted} admitted")
+
+# One slot per running or waiting heavy request; _running lets HEAVY_WORKERS of them execute.
+_slots = threading.BoundedSemaphore(_max_admitted)
+_running = threading.BoundedSemaphore(_max_running)
+_admitted = 0
+_admitted_lock = threading.Lock()
+
+# ---------------- Load ----------------
+def heavy_in_flight():
+    """Number of heavy requests currently admitted (running or waiting for their turn)."""
+    return _admitted
+
+# ---------------- Saturation Response ----------------
+def _busy_response():
+    response = jsonify({"status": "error", "message": "Server busy, please retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(HEAVY_RETRY_AFTER)
+    return response
+
+# ---------------- Decorator ----------------
+def heavy_endpoint(f):
+    """Admit the view if a heavy slot is free (503 + Retry-After otherwise), then run it once a worker turn is free."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        global _admitted
+        # Non-blocking: when every slot is taken the request is rejected instead of queueing without bound.
+        if not _slots.acquire(blocking=False):
+            log_message(HTTP_LOG_ID, f"Rejected {f.__name__}: heavy slots saturated")
+            return _busy_response()
+        with _admitted_lock:
+            _admitted += 1
+        try:
+            with _running:
+                return f(*args, **kwargs)
+        finally:
+            with _admitted_lock:
+                _admitted -= 1
+            _slots.release()
+    return decorated
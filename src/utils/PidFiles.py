@@ -8,6 +8,15 @@ import os # general OS utilities (checking/removing files).
 from src.settings.constants import APP_ID, APP_NAME, APP_VERSION, PROJECT_ROOT, ROUTE_ROOT, CONTROLLER_ROOT, RPI_ROOT
 from src.utils.logger import HTTP_LOG_ID, STT_LOG_ID, LOG_FILES
 
+# ---------------- Process Check ----------------
+# True when the PID file exists and names a live process (a crashed service leaves a stale file behind).
+def is_running(pid_file):
+    if not os.path.exists(pid_file):
+        return False
+    with open(pid_file, "r") as f:
+        pid_str = f.read().strip()
+    return pid_str.isdigit() and psutil.pid_exists(int(pid_str))
+
 # ---------------- Generic Process Stop ----------------
 def stop_process(pid_file, name):
 
@@ -32,8 +41,13 @@ def stop_process(pid_file, name):
     if psutil.pid_exists(pid):
         try:
             p = psutil.Process(pid)
+            children = p.children(recursive=True)  # e.g. pre-fork web workers
             p.terminate()       # send terminate signal
             p.wait(timeout=5)   # wait until process exits
+            # Children normally exit with their parent; kill any that were left behind.
+            _, alive = psutil.wait_procs(children, timeout=3)
+            for child in alive:
+                child.kill()
             print(Fore.RED + f"{name} with PID {pid} stopped.")
         except Exception as e:
             print(Fore.RED + f"Could not stop {name}: {e}")
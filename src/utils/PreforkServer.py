@@ -0,0 +1,232 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      PreforkServer.py:                                                                                                   ##
+##      ------------------------------------------------                                                                    ##
+##         1) Runs the Flask app in N waitress worker processes on the same port, so request work is not serialized by      ##
+##            a single GIL. Works on Windows and POSIX: workers are spawned with subprocess, not forked.                    ##
+##         2) The master binds the listening socket once (a busy port fails startup straight away) and hands it to every    ##
+##            worker: socket.share()/fromshare() on Windows, an inherited file descriptor elsewhere. All workers accept     ##
+##            from the same queue, so a worker that closes its copy never drops connections waiting to be accepted.         ##
+##         3) Workers recycle themselves after WEB_MAX_REQUESTS requests or WEB_MAX_MEMORY_MB of RSS: they stop accepting,  ##
+##            drain in-flight requests and exit; the master starts a replacement. Workers that die right after starting     ##
+##            are restarted with back-off, and the master gives up after MAX_FAST_EXITS in a row.                           ##
+##         4) The master stops a worker by closing its stdin (portable, and workers also exit if the master dies);          ##
+##            SIGTERM on the master (e.g. `iwlab automate --stop`) gracefully stops every worker.                           ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import base64 # socket.share() payload sent over the worker's stdin.
+import importlib # loads the app inside a worker ("module:attribute").
+import os # environment and pids.
+import signal # SIGTERM handling in master and workers.
+import socket # listening socket.
+import subprocess # spawns the worker processes.
+import sys # worker command line / stdin.
+import threading # per-worker counters and the recycle watcher thread.
+import time # polling intervals, drain deadlines and back-off.
+import psutil # worker memory (RSS) checks.
+from waitress.server import create_server
+from src.settings.constants import (PROJECT_ROOT, WEB_HOST, WEB_PORT, WEB_THREADS, WEB_CONNECTION_LIMIT,
+                                    WEB_CHANNEL_TIMEOUT, WEB_BACKLOG, WEB_MAX_REQUESTS, WEB_MAX_MEMORY_MB)
+from src.utils.logger import log_message, HTTP_LOG_ID
+
+DRAIN_TIMEOUT = 30      # seconds a recycling worker waits for in-flight requests
+IDLE_GRACE = 2          # seconds without traffic after which a connection no longer holds up the drain
+STOP_TIMEOUT = 4        # seconds the master waits for workers before killing them (stop_process waits 5)
+FAST_EXIT = 5           # a worker exiting within this many seconds of starting counts as a failed start
+MAX_FAST_EXITS = 5      # consecutive failed starts before the master gives up
+MAX_BACKOFF = 30        # seconds between restarts after repeated failed starts
+
+
+# ---------------- Request Tracking Middleware ----------------
+# Counts handled and in-flight requests so a worker knows when to recycle and when it has drained.
+class _RequestTracker:
+    def __init__(self, app):
+        self.app = app
+        self.handled = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return self.app(environ, start_response)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.handled += 1
+
+
+# ---------------- Listening Socket ----------------
+def _bind_socket():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name != "nt":
+        # On Windows SO_REUSEADDR would let a second server bind the same port; the default there is already safe.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((WEB_HOST, WEB_PORT))
+    sock.listen(WEB_BACKLOG)
+    return sock
+
+def _handoff(sock, pid):
+    # First line of the worker's stdin: how to get at the master's listening socket.
+    if os.name == "nt":
+        return b"share:" + base64.b64encode(sock.share(pid)) + b"\n"
+    return f"fd:{sock.fileno()}\n".encode()
+
+def _receive_socket(line):
+    kind, _, value = line.strip().partition(":")
+    if kind == "share":
+        return socket.fromshare(base64.b64decode(value))
+    if kind == "fd":
+        return socket.socket(fileno=int(value))
+    raise ValueError(f"Unexpected socket hand-off '{line.strip()}'")
+
+
+# ---------------- Worker Process ----------------
+def _load_app(app_path):
+    module, _, attribute = app_path.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+def _worker(app_path):
+    sock = _receive_socket(sys.stdin.readline())
+    tracker = _RequestTracker(_load_app(app_path))
+    server = create_server(tracker,
+                           sockets=[sock],
+                           threads=WEB_THREADS,
+                           connection_limit=WEB_CONNECTION_LIMIT,
+                           channel_timeout=WEB_CHANNEL_TIMEOUT,
+                           backlog=WEB_BACKLOG)
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl+C reaches the master, which stops us
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    def _wait_for_master():
+        # The master closes our stdin to stop us; EOF also arrives if the master dies.
+        sys.stdin.read()
+        stop.set()
+
+    def _should_recycle():
+        if WEB_MAX_REQUESTS and tracker.handled >= WEB_MAX_REQUESTS:
+            return f"served {tracker.handled} requests"
+        if WEB_MAX_MEMORY_MB:
+            rss_mb = psutil.Process().memory_info().rss / (1024 * 1024)
+            if rss_mb >= WEB_MAX_MEMORY_MB:
+                return f"RSS {rss_mb:.0f} MB"
+        return None
+
+    def _busy():
+        # Connections accepted just before the close may not have a parsed request yet; wait for them as well
+        # as for running requests. Idle keep-alive connections are left to the client's retry.
+        idle_before = time.time() - IDLE_GRACE
+        channels = list(server.active_channels.values())
+        return tracker.in_flight or any(ch.requests or ch.last_activity > idle_before for ch in channels)
+
+    def _watch():
+        reason = None
+        while not stop.is_set() and reason is None:
+            stop.wait(1)
+            reason = _should_recycle()
+        log_message(HTTP_LOG_ID, f"Worker {os.getpid()} stopping ({reason or 'shutdown'})")
+        # Close our copy of the listener from inside the event loop; other workers keep accepting from it.
+        server.trigger.pull_trigger(server.close)
+        deadline = time.time() + DRAIN_TIMEOUT
+        while _busy() and time.time() < deadline:
+            time.sleep(0.1)
+        server.task_dispatcher.shutdown()
+        os._exit(0)
+
+    threading.Thread(target=_wait_for_master, daemon=True).start()
+    threading.Thread(target=_watch, daemon=True).start()
+    server.run()
+
+def _worker_main(app_path):
+    try:
+        _worker(app_path)
+    except BaseException as e:
+        # Never fall back into anything else: report and exit so the master can back off.
+        log_message(HTTP_LOG_ID, f"Worker {os.getpid()} failed: {e!r}")
+        os._exit(1)
+    os._exit(0)
+
+
+# ---------------- Master Process ----------------
+def _spawn(app_path, sock):
+    env = os.environ.copy()
+    # Workers import the app as a package module, whichever way the master was started.
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    proc = subprocess.Popen([sys.executable, "-m", "src.utils.PreforkServer", app_path],
+                            stdin=subprocess.PIPE, env=env,
+                            pass_fds=() if os.name == "nt" else (sock.fileno(),))
+    proc.stdin.write(_handoff(sock, proc.pid))
+    proc.stdin.flush()
+    return proc
+
+def _stop_workers(children):
+    # Graceful shutdown: ask workers to drain, then force-kill stragglers.
+    for proc in children:
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+    deadline = time.time() + STOP_TIMEOUT
+    for proc in children:
+        try:
+            proc.wait(max(0, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+def run_prefork(app_path, workers):
+    """Serve the app at `app_path` ("module:attribute") from `workers` processes on WEB_PORT until SIGTERM/SIGINT."""
+    try:
+        sock = _bind_socket()
+    except OSError as e:
+        log_message(HTTP_LOG_ID, f"Pre-fork master cannot listen on {WEB_HOST}:{WEB_PORT}: {e}")
+        sys.exit(1)
+
+    children = {}   # Popen -> start time
+    stopping = threading.Event()
+    fast_exits = 0
+
+    def _stop(signum, frame):
+        stopping.set()
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    log_message(HTTP_LOG_ID, f"Pre-fork master {os.getpid()} starting {workers} workers on port {WEB_PORT}")
+    while not stopping.is_set():
+        # Keep the pool at full size (initial start and after each recycle).
+        while len(children) < workers and not stopping.is_set():
+            proc = _spawn(app_path, sock)
+            children[proc] = time.monotonic()
+            log_message(HTTP_LOG_ID, f"Worker {proc.pid} started")
+        stopping.wait(0.5)
+        # Classify every exited worker before backing off, so the wait doesn't make failed starts look healthy.
+        now = time.monotonic()
+        exited = [(proc, now - started) for proc, started in children.items() if proc.poll() is not None]
+        for proc, lifetime in exited:
+            del children[proc]
+            if lifetime >= FAST_EXIT:
+                fast_exits = 0
+                continue
+            # Died right after starting (import error, bad config...): back off instead of respawning in a loop.
+            fast_exits += 1
+            log_message(HTTP_LOG_ID, f"Worker {proc.pid} exited with code {proc.returncode} right after starting "
+                                     f"({fast_exits}/{MAX_FAST_EXITS})")
+        if fast_exits >= MAX_FAST_EXITS:
+            log_message(HTTP_LOG_ID, "Workers keep failing to start; stopping the pre-fork master")
+            break
+        if any(lifetime < FAST_EXIT for _, lifetime in exited):
+            stopping.wait(min(2 ** fast_exits, MAX_BACKOFF))
+
+    _stop_workers(children)
+    sock.close()
+    log_message(HTTP_LOG_ID, f"Pre-fork master {os.getpid()} stopped")
+    if fast_exits >= MAX_FAST_EXITS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Worker entry point: python -m src.utils.PreforkServer <module:attribute> (socket hand-off on stdin).
+    _worker_main(sys.argv[1])
@@ -0,0 +1,205 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      Profiler.py:                                                                                                        ##
+##      ------------------------------------------------                                                                    ##
+##         1) SamplingProfiler samples every thread's stack (sys._current_frames) for N seconds and writes a collapsed-     ##
+##            stack file ("thread;outer;inner count") that flamegraph.pl / speedscope load directly.                        ##
+##         2) memory_snapshot() drives tracemalloc: top allocation sites plus the diff against the previous snapshot.       ##
+##         3) Both processes can be profiled: the web process runs commands directly, the speech listener picks them up     ##
+##            from a queue of command files (send_command / watch_commands). Results land in data/profiles/<target>.*.     ##
+##            In pre-fork mode (WEB_WORKERS > 1) target=web is refused: each worker would profile only itself.              ##
+##         4) Nothing runs while profiling is off except the listener's once-a-second command-file check.                   ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import json # command file format.
+import os # general OS utilities (checking/removing files).
+import sys # sys._current_frames() for stack sampling.
+import threading # sampler and command-watcher threads.
+import time # sampling deadline.
+import tracemalloc # memory snapshots and diffs.
+from collections import Counter
+from src.settings.constants import DATA_DIR, WEB_WORKERS, SPEECH_PID_FILE
+from src.utils.logger import log_message, STT_LOG_ID
+from src.utils.PidFiles import is_running
+
+PROFILE_DIR = DATA_DIR / "profiles"
+TARGETS = ("web", "speech")
+MAX_SECONDS = 300
+MIN_INTERVAL_MS = 1
+COMMAND_TTL = 30        # seconds; older queued commands are dropped instead of run late
+TRACEMALLOC_FRAMES = 25
+
+
+# ---------------- Output Files ----------------
+def collapsed_path(target):
+    return PROFILE_DIR / f"{target}.collapsed"
+
+def memory_path(target):
+    return PROFILE_DIR / f"{target}-memory.txt"
+
+def _write(path, text):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+# ---------------- Sampling Profiler ----------------
+class SamplingProfiler:
+    # Wall-clock sampler: idle threads (waiting on locks/sockets) show up too, which is what you want
+    # when looking for where requests spend their time.
+    def __init__(self):
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds=10, interval=0.005, output=None):
+        """Sample for `seconds` (or until stop()); write the collapsed stacks to `output` when done."""
+        if self.running:
+            return False
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(min(seconds, MAX_SECONDS), interval, output),
+                                        name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, seconds, interval, output):
+        me = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while not self._stop.wait(interval) and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+        if output:
+            _write(output, self.collapsed())
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+_profiler = SamplingProfiler()
+
+
+# ---------------- tracemalloc ----------------
+_last_snapshot = None
+
+def memory_snapshot(limit=25):
+    """Start tracemalloc on first use; afterwards report top allocations and growth since the last snapshot."""
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        _last_snapshot = None
+        return "tracemalloc started; take another snapshot to see allocations.\n"
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"Traced memory: current {current / 1024 / 1024:.1f} MB, peak {peak / 1024 / 1024:.1f} MB", "",
+             f"Top {limit} allocation sites:"]
+    lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[:limit]]
+    if _last_snapshot is not None:
+        lines += ["", f"Top {limit} changes since previous snapshot:"]
+        lines += [f"  {stat}" for stat in snapshot.compare_to(_last_snapshot, "lineno")[:limit]]
+    _last_snapshot = snapshot
+    return "\n".join(lines) + "\n"
+
+def memory_stop():
+    global _last_snapshot
+    _last_snapshot = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+# ---------------- Commands ----------------
+def check_target(target):
+    """Raise ValueError for targets this process cannot profile consistently."""
+    if target not in TARGETS:
+        raise ValueError(f"Unknown profiling target '{target}'")
+    if target == "web" and WEB_WORKERS > 1:
+        # Start, stop and download could each land on a different worker process.
+        raise ValueError("Profiling target 'web' needs a single web worker (WEB_WORKERS=1)")
+
+def run_command(target, command):
+    """Execute a profiling command in this process; returns a status dict."""
+    action = command.get("action")
+    if action == "profile_start":
+        seconds = float(command.get("seconds", 10))
+        # Below 1 ms the sampler thread would spin and starve the process it is measuring.
+        interval = max(float(command.get("interval_ms", 5)), MIN_INTERVAL_MS) / 1000
+        started = _profiler.start(seconds, interval, collapsed_path(target))
+        return {"status": "started" if started else "already running", "seconds": seconds}
+    if action == "profile_stop":
+        _profiler.stop()
+        return {"status": "stopped", "samples": _profiler.samples}
+    if action == "memory_snapshot":
+        report = memory_snapshot(int(command.get("limit", 25)))
+        _write(memory_path(target), report)
+        return {"status": "snapshot written", "report": report}
+    if action == "memory_stop":
+        memory_stop()
+        return {"status": "tracemalloc stopped"}
+    raise ValueError(f"Unknown profiling action '{action}'")
+
+def _pending_commands(target):
+    # One file per command, named by send time, so a quick start + stop are both delivered, in order.
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    prefix = f"{target}-"
+    return sorted(PROFILE_DIR / name for name in os.listdir(PROFILE_DIR)
+                  if name.startswith(prefix) and name.endswith(".cmd"))
+
+def send_command(target, command):
+    """Run the command here for the web process; queue it for the speech listener as a command file."""
+    check_target(target)
+    if target == "web":
+        return run_command(target, command)
+    if not is_running(SPEECH_PID_FILE):
+        raise ValueError("Speech listener is not running")
+    path = PROFILE_DIR / f"{target}-{time.time_ns()}.cmd"
+    # Written under a temporary name first so the watcher never reads a half-written file.
+    _write(f"{path}.tmp", json.dumps(command))
+    os.replace(f"{path}.tmp", path)
+    return {"status": "sent to speech listener"}
+
+def watch_commands(target, poll=1.0):
+    """Start a daemon thread that executes commands written for `target` (used by the speech listener)."""
+    def _watch():
+        while True:
+            time.sleep(poll)
+            for path in _pending_commands(target):
+                try:
+                    if time.time() - os.path.getmtime(path) > COMMAND_TTL:
+                        # Queued while this listener was down or busy; running it now would surprise the sender.
+                        os.remove(path)
+                        log_message(STT_LOG_ID, f"Dropped stale profiling command {path.name}")
+                        continue
+                    with open(path, "r", encoding="utf-8") as f:
+                        text = f.read()
+                    os.remove(path)  # consumed even if invalid, so a bad file isn't retried forever
+                    run_command(target, json.loads(text))
+                except Exception as e:
+                    log_message(STT_LOG_ID, f"Profiling command for {target} failed: {e}")
+    threading.Thread(target=_watch, name="profile-commands", daemon=True).start()
@@ -0,0 +1,189 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      StaticAssets.py:                                                                                                    ##
+##      ------------------------------------------------                                                                    ##
+##         1) fetch_vendor_assets() downloads Bootstrap/jQuery into static/vendor once (on a connected machine), so the     ##
+##            templates never need a CDN - works on air-gapped hosts.                                                       ##
+##         2) build_assets() copies every static file to static/dist/<name>.<hash>.<ext>, precompresses text assets to      ##
+##            .gz (and .br when the `brotli` package is installed) and writes static/dist/manifest.json. Builds only add    ##
+##            files, so pages (and running servers) that still reference older hashed names keep working.                   ##
+##         3) prune_assets() removes hashed files that left the manifest more than PRUNE_AFTER_DAYS ago.                    ##
+##         4) init_static_assets(app) makes url_for('static', filename=...) return the fingerprinted name and serves it     ##
+##            with Cache-Control: immutable, picking the .br/.gz variant from the request's Accept-Encoding.                ##
+##         5) Templates link vendor files through vendor_url(name), which falls back to the CDN URL until they are fetched. ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import gzip # precompressed .gz variants.
+import hashlib # content hash used in fingerprinted file names.
+import json # manifest file.
+import mimetypes # Content-Type of the original (uncompressed) asset.
+import os # general OS utilities (checking/removing files).
+import time # age of superseded builds.
+import urllib.request # downloads the vendor assets.
+from flask import request, send_from_directory, url_for
+from src.settings.constants import PROJECT_ROOT
+from src.utils.logger import log_message, HTTP_LOG_ID
+
+try:
+    import brotli # optional: .br variants are skipped when it is not installed.
+except ImportError:
+    brotli = None
+
+STATIC_ROOT = PROJECT_ROOT / "static"
+DIST_DIR = STATIC_ROOT / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+# Logical name (relative to static/) -> upstream URL. Templates reference the logical name.
+VENDOR_ASSETS = {
+    "vendor/bootstrap.min.css": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "vendor/bootstrap.bundle.min.js": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js",
+    "vendor/jquery.min.js": "https://ajax.googleapis.com/ajax/libs/jquery/3.7.1/jquery.min.js",
+}
+
+COMPRESSIBLE = (".css", ".js", ".json", ".svg", ".html", ".txt", ".map")
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))   # preference order for content negotiation
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+PRUNE_AFTER_DAYS = 7    # superseded hashed files stay servable this long (cached HTML may still link them)
+
+_manifest = {}          # logical name -> fingerprinted name
+_fingerprinted = set()  # fingerprinted names (served as immutable)
+
+
+# ---------------- Fetch ----------------
+def fetch_vendor_assets():
+    """Download the vendor assets into static/ (run once, then commit/copy them)."""
+    for name, url in VENDOR_ASSETS.items():
+        target = STATIC_ROOT / name
+        os.makedirs(target.parent, exist_ok=True)
+        urllib.request.urlretrieve(url, target)
+        print(f"Fetched {url} -> {target}")
+
+
+# ---------------- Build ----------------
+def _source_files():
+    for root, dirs, files in os.walk(STATIC_ROOT):
+        if os.path.abspath(root).startswith(os.path.abspath(DIST_DIR)):
+            continue
+        for file in files:
+            path = os.path.join(root, file)
+            yield os.path.relpath(path, STATIC_ROOT).replace(os.sep, "/"), path
+
+def _write_atomic(path, data):
+    # Readers (other workers, a running server) never see a half-written file.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def _variants(fingerprinted):
+    path = str(STATIC_ROOT / fingerprinted)
+    return [path] + [path + suffix for _, suffix in ENCODINGS]
+
+def _read_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+def build_assets():
+    """Fingerprint and precompress every static file into static/dist and write the manifest (never deletes)."""
+    previous = _read_manifest()
+    manifest = {}
+    for name, path in _source_files():
+        with open(path, "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(name)
+        fingerprinted = f"dist/{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        manifest[name] = fingerprinted
+        target = STATIC_ROOT / fingerprinted
+        if os.path.exists(target):
+            continue   # same hash, same content: already built
+        os.makedirs(target.parent, exist_ok=True)
+        if ext in COMPRESSIBLE:
+            # mtime=0 keeps the .gz output byte-identical across builds.
+            _write_atomic(f"{target}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write_atomic(f"{target}.br", brotli.compress(data))
+        # Original last: its presence marks the whole set as built.
+        _write_atomic(target, data)
+    # Stamp files that just left the manifest, so prune_assets() measures age from when they were superseded.
+    now = time.time()
+    for fingerprinted in set(previous.values()) - set(manifest.values()):
+        for path in _variants(fingerprinted):
+            if os.path.exists(path):
+                os.utime(path, (now, now))
+    _write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+def prune_assets(max_age_days=PRUNE_AFTER_DAYS):
+    """Delete hashed files no longer in the manifest and untouched for max_age_days; returns how many."""
+    keep = {path for fingerprinted in _read_manifest().values() for path in _variants(fingerprinted)}
+    keep.add(str(MANIFEST_PATH))
+    cutoff = time.time() - max_age_days * 24 * 3600
+    removed = 0
+    for root, dirs, files in os.walk(DIST_DIR):
+        for file in files:
+            path = os.path.join(root, file)
+            if path not in keep and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+    return removed
+
+def _manifest_is_stale():
+    if not os.path.exists(MANIFEST_PATH):
+        return True
+    built = os.path.getmtime(MANIFEST_PATH)
+    return any(os.path.getmtime(path) > built for _, path in _source_files())
+
+
+# ---------------- Flask Integration ----------------
+def _fingerprint_url(endpoint, values):
+    # url_for('static', filename='js/utils.js') -> /static/dist/js/utils.<hash>.js
+    if endpoint == "static" and values.get("filename") in _manifest:
+        values["filename"] = _manifest[values["filename"]]
+
+def vendor_url(name):
+    """URL of a vendor asset: the local (fingerprinted) copy when fetched, otherwise its CDN URL."""
+    if os.path.exists(STATIC_ROOT / name):
+        return url_for("static", filename=name)
+    return VENDOR_ASSETS[name]
+
+def _send_static(filename):
+    response = None
+    # Content negotiation: serve the precompressed variant the client accepts.
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(STATIC_ROOT, filename + suffix)):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(STATIC_ROOT, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    if response is None:
+        response = send_from_directory(STATIC_ROOT, filename)
+    response.vary.add("Accept-Encoding")
+    if filename in _fingerprinted:
+        # The name changes whenever the content does, so the browser never has to revalidate.
+        response.cache_control.no_cache = None   # Flask's send_file default
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+def init_static_assets(app):
+    """Rebuild static/dist when sources changed, then hook url_for('static') and the static route."""
+    global _manifest, _fingerprinted
+    missing = [name for name in VENDOR_ASSETS if not os.path.exists(STATIC_ROOT / name)]
+    if missing:
+        log_message(HTTP_LOG_ID, f"Vendor assets missing ({', '.join(missing)}); "
+                                 "linking the CDN until `iwlab assets --fetch` is run")
+    _manifest = build_assets() if _manifest_is_stale() else _read_manifest()
+    _fingerprinted = set(_manifest.values())
+    app.url_defaults(_fingerprint_url)
+    app.view_functions["static"] = _send_static
+    app.jinja_env.globals["vendor_url"] = vendor_url
+
+
+if __name__ == "__main__":
+    build_assets()
+    print(f"Static assets built into {DIST_DIR}")
@@ -0,0 +1,135 @@
+##############################################################################################################################
+##                                                                                                                          ##
+##      ------------------------------------------------                                                                    ##
+##      TranscriptStore.py:                                                                                                 ##
+##      ------------------------------------------------                                                                    ##
+##         1) Stores recognized utterances (timestamp, device id, confidence, text) in an embedded SQLite database with an  ##
+##            FTS5 full-text index kept in sync by a trigger.                                                               ##
+##         2) TranscriptWriter batches inserts on a background thread: one transaction per batch instead of per utterance.  ##
+##         3) search_transcripts() runs paginated full-text / time-range queries (used by the web process).                 ##
+##         4) WAL journal mode lets the web process read while the speech listener writes.                                  ##
+##                                                                                                                          ##
+##############################################################################################################################
+
+import os # general OS utilities (checking/removing files).
+import queue # hands utterances from the recognizer loop to the writer thread.
+import sqlite3 # embedded database with the FTS5 full-text index.
+import threading # background writer thread.
+import time # utterance timestamps and flush intervals.
+from src.settings.constants import TRANSCRIPT_DB
+
+BATCH_SIZE = 50         # utterances per transaction
+FLUSH_INTERVAL = 2.0    # seconds before a partial batch is written anyway
+MAX_PER_PAGE = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    device_id INTEGER,
+    confidence REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_utterances_ts ON utterances(ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(text, content='utterances', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS utterances_ai AFTER INSERT ON utterances BEGIN
+    INSERT INTO utterances_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS utterances_ad AFTER DELETE ON utterances BEGIN
+    INSERT INTO utterances_fts(utterances_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# ---------------- Connection ----------------
+def connect(db_path=TRANSCRIPT_DB):
+    """Open the transcript database, creating the schema on first use."""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ---------------- Batched Writer ----------------
+class TranscriptWriter:
+    # Call add() from the recognizer loop; a daemon thread commits utterances in batches.
+    def __init__(self, db_path=TRANSCRIPT_DB):
+        self.db_path = db_path
+        self.q = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, text, device_id=None, confidence=None, ts=None):
+        self.q.put((ts or time.time(), device_id, confidence, text))
+
+    def close(self):
+        """Flush pending utterances and stop the writer thread."""
+        self.q.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = connect(self.db_path)
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    item = self.q.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                with conn:
+                    conn.executemany("INSERT INTO utterances (ts, device_id, confidence, text) VALUES (?, ?, ?, ?)", batch)
+        conn.close()
+
+
+# ---------------- Query ----------------
+def _fts_query(text):
+    # Quote every word so user input can't trip FTS5 syntax; words are AND-ed.
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+def search_transcripts(q=None, page=1, per_page=50, device_id=None, since=None, until=None, db_path=TRANSCRIPT_DB):
+    """
+    Newest-first utterances matching the filters.
+    q: words that must all appear; since/until: unix timestamps.
+    Returns {"total", "page", "per_page", "items": [{id, ts, device_id, confidence, text, snippet}]}.
+    """
+    page = max(1, int(page))
+    per_page = min(max(1, int(per_page)), MAX_PER_PAGE)
+    where, params = [], []
+    if q and q.strip():
+        source = "utterances_fts JOIN utterances u ON u.id = utterances_fts.rowid"
+        snippet = "snippet(utterances_fts, 0, '[', ']', '...', 12)"
+        where.append("utterances_fts MATCH ?")
+        params.append(_fts_query(q))
+    else:
+        source = "utterances u"
+        snippet = "NULL"
+    if device_id is not None:
+        where.append("u.device_id = ?")
+        params.append(int(device_id))
+    if since is not None:
+        where.append("u.ts >= ?")
+        params.append(float(since))
+    if until is not None:
+        where.append("u.ts < ?")
+        params.append(float(until))
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+    conn = connect(db_path)
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM {source}{clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT u.id, u.ts, u.device_id, u.confidence, u.text, {snippet} AS snippet FROM {source}{clause} "
+            f"ORDER BY u.id DESC LIMIT ? OFFSET ?",
+            params + [per_page, (page - 1) * per_page]).fetchall()
+    finally:
+        conn.close()
+    return {"total": total, "page": page, "per_page": per_page, "items": [dict(row) for row in rows]}
@@ -1,12 +1,68 @@
+import os
+import sys
 import subprocess
+import tempfile
+import threading
+import time
+import psutil
+from src.settings.constants import ENCODE_PROFILE
+from src.utils.HeavyExecutor import heavy_in_flight
+from src.utils.logger import log_message, HTTP_LOG_ID
 
-def convert_webm_to_mp4(webm_path, mp4_path):
-    """Convert WebM to MP4 using FFmpeg"""
-    subprocess.run([
-        "ffmpeg", "-i", webm_path,
-        "-c:v", "libx264", "-c:a", "aac", "-strict", "experimental",
-        mp4_path
-    ], check=True)
+# ffmpeg output options per profile (everything after the input).
+ENCODE_PROFILES = {
+    # Cheapest usable video: fastest preset, lower quality, capped at 480p.
+    "preview": ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "30", "-vf", "scale=-2:'min(480,ih)'",
+                "-c:a", "aac", "-b:a", "96k"],
+    # Small files at high quality; costs several times the CPU of preview.
+    "archival": ["-c:v", "libx264", "-preset", "slow", "-crf", "20", "-c:a", "aac", "-b:a", "160k"],
+    # Drops the video track entirely (explicit opt-in only; auto never picks it).
+    "audio-only": ["-vn", "-c:a", "aac", "-b:a", "128k"],
+}
+
+# Load thresholds above which automatic selection drops from archival to preview (CPU percent / queue depth).
+BUSY_CPU_PERCENT = 50
+BUSY_QUEUE_DEPTH = 1
+
+_active_encodes = 0
+_active_lock = threading.Lock()
+
+def select_encode_profile(queue_depth=None, cpu_percent=None):
+    """Pick preview or archival from current CPU load and queue depth (encodes running + other heavy requests)."""
+    if queue_depth is None:
+        # heavy_in_flight() includes the calling request itself.
+        queue_depth = max(_active_encodes, heavy_in_flight() - 1)
+    if cpu_percent is None:
+        cpu_percent = psutil.cpu_percent(interval=0.1)
+    if cpu_percent >= BUSY_CPU_PERCENT or queue_depth >= BUSY_QUEUE_DEPTH:
+        return "preview"
+    return "archival"
+
+def convert_webm_to_mp4(webm_path, mp4_path, profile=None):
+    """Convert WebM to MP4 using FFmpeg; returns the encode profile used"""
+    global _active_encodes
+    profile = profile or ENCODE_PROFILE
+    if profile != "auto" and profile not in ENCODE_PROFILES:
+        log_message(HTTP_LOG_ID, f"Unknown encode profile '{profile}' "
+                                 f"(expected auto, {', '.join(ENCODE_PROFILES)}); using auto")
+        profile = "auto"
+    if profile == "auto":
+        profile = select_encode_profile()
+    with _active_lock:
+        _active_encodes += 1
+        # Concurrent encodes share the cores instead of each spawning cpu_count threads.
+        threads = max(1, (os.cpu_count() or 1) // _active_encodes)
+    try:
+        subprocess.run([
+            "ffmpeg", "-y", "-i", webm_path,
+            *ENCODE_PROFILES[profile],
+            "-threads", str(threads),
+            mp4_path
+        ], check=True)
+    finally:
+        with _active_lock:
+            _active_encodes -= 1
+    return profile
 
 def convert_mp4_to_wav(mp4_path, wav_path):
     """Extract WAV audio from MP4 using FFmpeg"""
@@ -17,4 +73,41 @@ def convert_mp4_to_wav(mp4_path, wav_path):
         "-ar", "44100",
         "-ac", "2",
         wav_path
-    ], check=True)
\ No newline at end of file
+    ], check=True)
+
+# ---------------- Benchmark ----------------
+def make_sample_clip(path, seconds=10, size="1280x720"):
+    """Generate a synthetic WebM (test pattern + tone) for benchmarking."""
+    subprocess.run([
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=duration={seconds}:size={size}:rate=30",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:v", "libvpx", "-b:v", "2M", "-c:a", "libopus",
+        path
+    ], check=True)
+
+def benchmark_profiles(clips):
+    """Encode each clip with every profile; returns [{clip, profile, seconds, size_bytes}]."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for clip in clips:
+            for profile in ENCODE_PROFILES:
+                out = os.path.join(tmp, f"{profile}.mp4")
+                start = time.perf_counter()
+                subprocess.run([
+                    "ffmpeg", "-y", "-loglevel", "error", "-i", clip, *ENCODE_PROFILES[profile], out
+                ], check=True)
+                results.append({"clip": clip, "profile": profile,
+                                "seconds": time.perf_counter() - start, "size_bytes": os.path.getsize(out)})
+    return results
+
+if __name__ == "__main__":
+    # python -m src.utils.VFUtils [clip.webm ...]  (no clips: a 10 s synthetic 720p sample is generated)
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = sys.argv[1:]
+        if not clips:
+            clips = [os.path.join(tmp, "sample.webm")]
+            make_sample_clip(clips[0])
+        print(f"{'clip':<30} {'profile':<12} {'seconds':>8} {'size (KB)':>10}")
+        for r in benchmark_profiles(clips):
+            print(f"{os.path.basename(r['clip']):<30} {r['profile']:<12} {r['seconds']:>8.2f} {r['size_bytes'] / 1024:>10.0f}")